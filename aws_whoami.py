@@ -14,18 +14,22 @@
 
 """Utility for determining what AWS account and identity you're using."""
 
+from __future__ import annotations
 from __future__ import print_function
 
-import argparse
 from collections import namedtuple
 import json
 import sys
 import os
-import traceback
+import re
 
-import botocore
-import botocore.session
-from botocore.exceptions import ClientError
+# botocore and the modules only used past argument parsing are imported
+# where they're used, so that --version and --help don't pay for them
+
+# typing is only needed by type checkers, so it isn't imported at runtime
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
 
 __version__ = '1.2.0'
 
@@ -41,48 +45,231 @@ WhoamiInfo = namedtuple('WhoamiInfo', [
     'SSOPermissionSet',
 ])
 
+# values for AWS_WHOAMI_DISABLE_ACCOUNT_ALIAS
+_FALSY = frozenset(('', '0', 'false'))
+_TRUTHY = frozenset(('1', 'true'))
+
+# fields matched against AWS_WHOAMI_DISABLE_ACCOUNT_ALIAS values
+_FILTER_FIELDS = ('Name', 'Arn', 'RoleSessionName')
+
+# the resource is {type}/{name}, except for assumed roles,
+# which are assumed-role/{role-name}/{role-session-name}
+_ARN_RE = re.compile(
+    r'^arn:[^:]*:[^:]*:[^:]*:[^:]*:'
+    r'(?:(?P<assumed_role>assumed-role)|(?!assumed-role/)(?P<type>[^/]+))/'
+    r'(?P<name>.+?)'
+    r'(?(assumed_role)/(?P<session>[^/]+))$'
+)
+
+_SSO_ROLE_PREFIX = 'AWSReservedSSO'
+
+# short timeouts and few retries, since this is meant to be quick
+_CLIENT_CONFIG_ARGS = {
+    'max_pool_connections': 50,
+    'tcp_keepalive': True,
+    'connect_timeout': 3,
+    'read_timeout': 5,
+    'retries': {'max_attempts': 2, 'mode': 'standard'},
+}
+
+# clients are stored on the session under this attribute, so they live
+# exactly as long as the session does
+_CLIENT_CACHE_ATTR = '_aws_whoami_clients'
+
+CACHE_DIR = os.path.join(os.path.expanduser('~'), '.aws', 'whoami-cache')
+DEFAULT_CACHE_TTL = 600
+
+# profile settings that determine the identity, for profiles whose
+# credentials are temporary and get a new access key on every run
+_PROFILE_IDENTITY_KEYS = (
+    'role_arn',
+    'source_profile',
+    'credential_source',
+    'role_session_name',
+    'web_identity_token_file',
+    'sso_session',
+    'sso_start_url',
+    'sso_account_id',
+    'sso_role_name',
+    'credential_process',
+)
+
 DESCRIPTION = """\
 Show what AWS account and identity you're using.
 Formats the output of sts.GetCallerIdentity nicely,
 and also gets your account alias (if you're allowed)
 """
 
-def main():
-    parser = argparse.ArgumentParser(description=DESCRIPTION)
-
-    parser.add_argument('--profile', help="AWS profile to use")
-
-    parser.add_argument('--json', action='store_true', help="Output as JSON")
+USAGE = "usage: {prog} [-h] [--profile PROFILE] [--json] [--field FIELD] [--no-aliases] [--version] [--debug]"
+
+OPTIONS = """\
+options:
+  -h, --help            show this help message and exit
+  --profile PROFILE     AWS profile to use
+  --json                Output as JSON
+  --field FIELD, -f FIELD
+                        Only output the given field (can be given multiple
+                        times). The account alias is not retrieved unless
+                        AccountAliases is selected. One of:
+                        {fields}
+  --no-aliases          Don't retrieve the account alias
+  --version             Print the version and exit
+  --debug               Print a traceback on error
+"""
 
-    parser.add_argument('--version', action='store_true')
+# argparse is slow to import relative to the rest of startup, and the
+# options are simple enough to handle directly
+class _Args:
+    def __init__(self) -> None:
+        self.profile = None # type: Optional[str]
+        self.json = False
+        self.field = None # type: Optional[List[str]]
+        self.no_aliases = False
+        self.version = False
+        self.debug = False
+        self.help = False
+
+class _UsageError(Exception):
+    pass
+
+def _parse_args(argv: List[str]) -> _Args:
+    # like argparse, unrecognized arguments are only reported at the end,
+    # and help is shown as soon as it's seen
+    args = _Args()
+    unrecognized = [] # type: List[str]
+    i = 0
+    while i < len(argv):
+        arg = argv[i]
+        i += 1
+        if arg in ('-h', '--help'):
+            args.help = True
+            return args
+        elif arg == '--json':
+            args.json = True
+        elif arg == '--no-aliases':
+            args.no_aliases = True
+        elif arg == '--version':
+            args.version = True
+        elif arg == '--debug':
+            args.debug = True
+        else:
+            name, sep, value = arg.partition('=')
+            if name.startswith('-f') and len(name) > 2 and not name.startswith('--'):
+                # -fVALUE
+                name, sep, value = '-f', '', arg[2:]
+            elif name in ('--profile', '--field', '-f') and not sep:
+                if i >= len(argv):
+                    raise _UsageError('argument {}: expected one argument'.format(name))
+                value = argv[i]
+                i += 1
+            elif name not in ('--profile', '--field', '-f'):
+                unrecognized.append(arg)
+                continue
+
+            if name == '--profile':
+                args.profile = value
+            else:
+                if value not in WhoamiInfo._fields:
+                    raise _UsageError('argument --field/-f: invalid choice: {!r} (choose from {})'.format(
+                        value, ', '.join(WhoamiInfo._fields)))
+                if args.field is None:
+                    args.field = []
+                args.field.append(value)
+    if unrecognized:
+        raise _UsageError('unrecognized arguments: {}'.format(' '.join(unrecognized)))
+    return args
+
+def main() -> None:
+    prog = os.path.basename(sys.argv[0])
+    usage = USAGE.format(prog=prog)
 
-    parser.add_argument('--debug', action='store_true')
+    try:
+        args = _parse_args(sys.argv[1:])
+    except _UsageError as e:
+        sys.stderr.write('{}\n{}: error: {}\n'.format(usage, prog, e))
+        sys.exit(2)
 
-    args = parser.parse_args()
+    if args.help:
+        print('{}\n\n{}\n{}'.format(usage, DESCRIPTION, OPTIONS.format(fields=', '.join(WhoamiInfo._fields))), end='')
+        sys.exit(0)
 
     if args.version:
         print(__version__)
-        parser.exit()
+        sys.exit(0)
+
+    import botocore.session
+    from botocore.exceptions import ClientError
 
     try:
         session = botocore.session.Session(profile=args.profile)
+        _use_trimmed_iam_model(session)
 
-        disable_account_alias = os.environ.get('AWS_WHOAMI_DISABLE_ACCOUNT_ALIAS', '')
-        if disable_account_alias.lower() in ['', '0', 'false']:
-            disable_account_alias = False
-        elif disable_account_alias.lower() in ['1', 'true']:
+        disable_account_alias_value = os.environ.get('AWS_WHOAMI_DISABLE_ACCOUNT_ALIAS', '')
+        disable_account_alias = False # type: Union[bool, Sequence[str]]
+        if disable_account_alias_value.lower() in _TRUTHY:
             disable_account_alias = True
-        else:
-            disable_account_alias = disable_account_alias.split(',')
+        elif disable_account_alias_value.lower() not in _FALSY:
+            disable_account_alias = disable_account_alias_value.split(',')
 
-        whoami_info = whoami(session=session, disable_account_alias=disable_account_alias)
+        if args.no_aliases or (args.field and 'AccountAliases' not in args.field):
+            disable_account_alias = True
 
-        if args.json:
-            print(json.dumps(whoami_info._asdict()))
+        cache_ttl = _get_cache_ttl()
+        cache_path = None
+        if cache_ttl > 0:
+            cache_path = _get_cache_path(session, disable_account_alias)
+
+        whoami_info = None
+        if cache_path:
+            whoami_info = _read_cache(cache_path, cache_ttl)
+            if whoami_info is not None:
+                # a cached identity is only good while its credentials are,
+                # e.g., an expired SSO login must still be reported
+                try:
+                    _check_credentials(session)
+                except Exception:
+                    _remove_cache(cache_path)
+                    raise
+        if whoami_info is None:
+            import threading
+
+            # resolve the STS hostname while the clients are being created
+            prewarm_args = (
+                session.get_config_variable('region'),
+                session.get_config_variable('sts_regional_endpoints'),
+            )
+            threading.Thread(target=_prewarm_dns, args=prewarm_args, daemon=True).start()
+            try:
+                whoami_info = whoami(session=session, disable_account_alias=disable_account_alias)
+            except ClientError:
+                if cache_path:
+                    _remove_cache(cache_path)
+                raise
+            if cache_path:
+                _write_cache(cache_path, whoami_info, cache_ttl)
+
+        if args.field:
+            fields = [(field, getattr(whoami_info, field)) for field in args.field]
+            if args.json:
+                output = _dumps(dict(fields))
+            else:
+                output = _format_fields(fields)
+        elif args.json:
+            output = _dumps(whoami_info._asdict())
         else:
-            print(format_whoami(whoami_info))
+            output = format_whoami(whoami_info)
+
+        try:
+            sys.stdout.write(output + '\n')
+            sys.stdout.flush()
+        except BrokenPipeError:
+            # the reader has gone away (e.g., piped to head), which is fine
+            # point stdout at devnull so the flush at exit doesn't fail too
+            devnull = os.open(os.devnull, os.O_WRONLY)
+            os.dup2(devnull, sys.stdout.fileno())
     except Exception as e:
         if args.debug:
+            import traceback
             traceback.print_exc()
         err_cls = type(e)
         err_cls_str = err_cls.__name__
@@ -91,86 +278,436 @@ def main():
         sys.stderr.write('ERROR [{}]: {}\n'.format(err_cls_str, e))
         sys.exit(1)
 
-def format_whoami(whoami_info):
-    lines = []
-    lines.append(('Account: ', whoami_info.Account))
-    for alias in whoami_info.AccountAliases:
-        lines.append(('', alias))
-    lines.append(('Region: ', whoami_info.Region))
+# The subset of the IAM service model needed for ListAccountAliases.
+# The full model is large and slow to parse; this API won't change.
+# STS isn't trimmed, because botocore's credential providers use it too.
+_IAM_SERVICE_MODEL = { # type: Dict[str, Any]
+    'version': '2.0',
+    'metadata': {
+        'apiVersion': '2010-05-08',
+        'endpointPrefix': 'iam',
+        'globalEndpoint': 'iam.amazonaws.com',
+        'protocol': 'query',
+        'protocols': ['query'],
+        'serviceAbbreviation': 'IAM',
+        'serviceFullName': 'AWS Identity and Access Management',
+        'serviceId': 'IAM',
+        'signatureVersion': 'v4',
+        'auth': ['aws.auth#sigv4'],
+        'uid': 'iam-2010-05-08',
+        'xmlNamespace': 'https://iam.amazonaws.com/doc/2010-05-08/',
+    },
+    'operations': {
+        'ListAccountAliases': {
+            'name': 'ListAccountAliases',
+            'http': {'method': 'POST', 'requestUri': '/'},
+            'input': {'shape': 'ListAccountAliasesRequest'},
+            'output': {
+                'shape': 'ListAccountAliasesResponse',
+                'resultWrapper': 'ListAccountAliasesResult',
+            },
+        },
+    },
+    'shapes': {
+        'ListAccountAliasesRequest': {
+            'type': 'structure',
+            'members': {
+                'Marker': {'shape': 'markerType'},
+                'MaxItems': {'shape': 'maxItemsType'},
+            },
+        },
+        'ListAccountAliasesResponse': {
+            'type': 'structure',
+            'required': ['AccountAliases'],
+            'members': {
+                'AccountAliases': {'shape': 'accountAliasListType'},
+                'IsTruncated': {'shape': 'booleanType'},
+                'Marker': {'shape': 'responseMarkerType'},
+            },
+        },
+        'accountAliasListType': {'type': 'list', 'member': {'shape': 'accountAliasType'}},
+        'accountAliasType': {'type': 'string'},
+        'booleanType': {'type': 'boolean'},
+        'markerType': {'type': 'string'},
+        'maxItemsType': {'type': 'integer'},
+        'responseMarkerType': {'type': 'string'},
+    },
+}
+
+def _use_trimmed_iam_model(session: Any) -> None:
+    """Make the session load the trimmed IAM service model instead of botocore's."""
+    import copy
+    from botocore.loaders import create_loader
+
+    loader = create_loader(session.get_config_variable('data_path'))
+    load_full_service_model = loader.load_service_model
+
+    def load_service_model(service_name: str, type_name: str, api_version: Optional[str] = None) -> Any:
+        if service_name == 'iam' and type_name == 'service-2':
+            return copy.deepcopy(_IAM_SERVICE_MODEL)
+        return load_full_service_model(service_name, type_name, api_version=api_version)
+
+    loader.load_service_model = load_service_model
+    session.register_component('data_loader', loader)
+
+def _prewarm_dns(region: Optional[str], sts_regional_endpoints: Optional[str]) -> None:
+    """Resolve the STS hostname, so the system resolver has it cached.
+
+    Endpoint overrides aren't predicted; a wrong host only costs a DNS
+    lookup on a background thread.
+    """
+    import socket
+
+    if os.environ.get('AWS_ENDPOINT_URL_STS') or os.environ.get('AWS_ENDPOINT_URL'):
+        return
+    if region and sts_regional_endpoints != 'legacy':
+        host = 'sts.{}.amazonaws.com'.format(region)
+        if region.startswith('cn-'):
+            host += '.cn'
+    else:
+        host = 'sts.amazonaws.com'
+    try:
+        socket.getaddrinfo(host, 443, 0, socket.SOCK_STREAM)
+    except Exception:
+        pass
+
+def _get_cache_ttl() -> int:
+    try:
+        return int(os.environ.get('AWS_WHOAMI_CACHE_TTL', DEFAULT_CACHE_TTL))
+    except ValueError:
+        return DEFAULT_CACHE_TTL
+
+def _get_identity_source(session: Any) -> Optional[str]:
+    """Return a string identifying where the session's credentials come from."""
+    if session.instance_variables().get('profile') is None:
+        # environment credentials take precedence unless a profile is given explicitly
+        if os.environ.get('AWS_ACCESS_KEY_ID'):
+            return 'env:' + os.environ['AWS_ACCESS_KEY_ID']
+        if os.environ.get('AWS_ROLE_ARN'):
+            return 'env-role:' + os.environ['AWS_ROLE_ARN']
+    config = session.get_scoped_config()
+    profile_settings = ['{}={}'.format(key, config[key]) for key in _PROFILE_IDENTITY_KEYS if key in config]
+    if profile_settings:
+        return 'profile:' + ','.join(profile_settings)
+    credentials = session.get_credentials()
+    if credentials is None:
+        return None
+    return 'key:' + credentials.access_key
+
+def _check_credentials(session: Any) -> None:
+    """Resolve the session's credentials, raising if that fails."""
+    from botocore.exceptions import NoCredentialsError
+
+    credentials = session.get_credentials()
+    if credentials is None:
+        raise NoCredentialsError()
+    # assume-role and SSO credentials are deferred until used
+    credentials.get_frozen_credentials()
+
+def _get_cache_path(session: Any, disable_account_alias: Union[bool, Sequence[str]]) -> Optional[str]:
+    import hashlib
+
+    try:
+        identity_source = _get_identity_source(session)
+    except Exception:
+        # e.g., a missing profile, which whoami() will report
+        return None
+    if identity_source is None:
+        return None
+    key_parts = [
+        session.profile or '',
+        identity_source,
+        session.get_config_variable('region') or '',
+        json.dumps(disable_account_alias),
+    ]
+    key = hashlib.sha256('\0'.join(key_parts).encode('utf-8')).hexdigest()
+    return os.path.join(CACHE_DIR, key + '.json')
+
+def _read_cache(cache_path: str, cache_ttl: int) -> Optional[WhoamiInfo]:
+    import time
+
+    try:
+        if os.path.getmtime(cache_path) <= time.time() - cache_ttl:
+            return None
+        with open(cache_path) as fp:
+            data = json.load(fp)
+        return WhoamiInfo(**data)
+    except Exception:
+        # a missing or unreadable cache just means a cache miss
+        return None
+
+def _write_cache(cache_path: str, whoami_info: WhoamiInfo, cache_ttl: int) -> None:
+    import tempfile
+
+    try:
+        cache_dir = os.path.dirname(cache_path)
+        if not os.path.isdir(cache_dir):
+            os.makedirs(cache_dir, 0o700)
+        fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w') as fp:
+                json.dump(whoami_info._asdict(), fp)
+            os.replace(tmp_path, cache_path)
+        except Exception:
+            os.remove(tmp_path)
+            raise
+        _prune_cache(cache_dir, cache_ttl)
+    except Exception:
+        # caching is best-effort
+        pass
+
+def _prune_cache(cache_dir: str, cache_ttl: int) -> None:
+    """Remove expired entries (and any abandoned temp files)."""
+    import time
+
+    cutoff = time.time() - cache_ttl
+    for name in os.listdir(cache_dir):
+        if not name.endswith(('.json', '.tmp')):
+            continue
+        path = os.path.join(cache_dir, name)
+        try:
+            if os.path.getmtime(path) <= cutoff:
+                os.remove(path)
+        except OSError:
+            pass
+
+def _remove_cache(cache_path: str) -> None:
+    try:
+        os.remove(cache_path)
+    except OSError:
+        pass
+
+def format_whoami(whoami_info: WhoamiInfo) -> str:
     if whoami_info.SSOPermissionSet:
-        lines.append(('AWS SSO: ', whoami_info.SSOPermissionSet))
+        principal_line = ('AWS SSO: ', whoami_info.SSOPermissionSet)
     else:
         type_str = ''.join(p[0].upper() + p[1:] for p in whoami_info.Type.split('-'))
-        lines.append(('{}: '.format(type_str), whoami_info.Name))
+        principal_line = (type_str + ': ', whoami_info.Name)
+    lines = [('Account: ', whoami_info.Account)] # type: List[Tuple[str, Optional[str]]]
+    lines.extend(('', alias) for alias in whoami_info.AccountAliases)
+    lines.append(('Region: ', whoami_info.Region))
+    lines.append(principal_line)
     if whoami_info.RoleSessionName:
         lines.append(('RoleSessionName: ', whoami_info.RoleSessionName))
     lines.append(('UserId: ', whoami_info.UserId))
     lines.append(('Arn: ', whoami_info.Arn))
     max_len = max(len(l[0]) for l in lines)
-    return '\n'.join("{}{}".format(l[0].ljust(max_len), l[1]) for l in lines)
+    return '\n'.join('%-*s%s' % (max_len, k, v) for k, v in lines)
 
-def whoami(session=None, disable_account_alias=False):
+def _format_fields(fields: List[Tuple[str, Any]]) -> str:
+    lines = []
+    for _, value in fields:
+        if value is None:
+            value = ''
+        elif isinstance(value, list):
+            value = ','.join(value)
+        lines.append(value)
+    return '\n'.join(lines)
+
+def _dumps(obj: Any) -> str:
+    # orjson is imported here so that startup doesn't pay for it
+    try:
+        import orjson
+    except ImportError:
+        return json.dumps(obj)
+    return orjson.dumps(obj).decode('utf-8')
+
+def whoami(session: Any = None, disable_account_alias: Union[bool, Sequence[str]] = False) -> WhoamiInfo:
     """Return a WhoamiInfo namedtuple.
 
     Args:
         session: An optional boto3 or botocore Session
         disable_account_alias (bool): Disable checking the account alias
 
+    Clients are cached per session, so calling this repeatedly with the
+    same session is cheap and reuses HTTPS connections.
+
     Returns:
         WhoamiInfo: Data on the current IAM principal, account, and region.
 
     """
+    import threading
+    import botocore.session
+
     if session is None:
         session = botocore.session.get_session()
     elif hasattr(session, '_session'): # allow boto3 Session as well
         session = session._session
 
-    data = {}
-    data['Region'] = session.get_config_variable('region')
+    region = session.get_config_variable('region')
 
-    response = session.create_client('sts').get_caller_identity()
+    sts_client = _get_client(session, 'sts')
 
-    for field in ['Account', 'Arn', 'UserId']:
-        data[field] = response[field]
+    if disable_account_alias is not False:
+        # either the alias isn't wanted, or the filters have to be checked
+        # against the identity before deciding to call IAM at all
+        response = sts_client.get_caller_identity()
+        whoami_info, disable_account_alias = _build_whoami_info(response, region, disable_account_alias)
+        if not disable_account_alias:
+            whoami_info.AccountAliases.extend(_get_account_aliases(_get_client(session, 'iam')))
+        return whoami_info
 
-    data['Type'], name = data['Arn'].rsplit(':', 1)[1].split('/',1)
+    iam_client = _get_client(session, 'iam')
 
-    if data['Type'] == 'assumed-role':
-        data['Name'], data['RoleSessionName'] = name.rsplit('/', 1)
-    else:
-        data['Name'] = name
-        data['RoleSessionName'] = None
-
-    if data['Type'] == 'assumed-role' and data['Name'].startswith('AWSReservedSSO'):
+    # the two calls are independent, so make the IAM call on another thread
+    # it's a daemon thread so that if STS fails, exit doesn't wait for it
+    iam_result = {} # type: Dict[str, Any]
+    def get_account_aliases() -> None:
         try:
-            # format is AWSReservedSSO_{permission-set}_{random-tag}
-            data['SSOPermissionSet'] = data['Name'].split('_', 1)[1].rsplit('_', 1)[0]
+            iam_result['aliases'] = _get_account_aliases(iam_client)
         except Exception as e:
-            data['SSOPermissionSet'] = None
-    else:
-        data['SSOPermissionSet'] = None
+            iam_result['error'] = e
+    iam_thread = threading.Thread(target=get_account_aliases, daemon=True)
+    iam_thread.start()
+
+    response = sts_client.get_caller_identity()
+
+    whoami_info, _ = _build_whoami_info(response, region, disable_account_alias)
+
+    iam_thread.join()
+    if 'error' in iam_result:
+        raise iam_result['error']
+    whoami_info.AccountAliases.extend(iam_result['aliases'])
+
+    return whoami_info
+
+async def whoami_async(session: Any = None, disable_account_alias: Union[bool, Sequence[str]] = False) -> WhoamiInfo:
+    """Return a WhoamiInfo namedtuple, using aiobotocore.
+
+    Requires the aiobotocore package (the "async" extra).
+
+    Args:
+        session: An optional aiobotocore AioSession
+        disable_account_alias (bool): Disable checking the account alias
+
+    Returns:
+        WhoamiInfo: Data on the current IAM principal, account, and region.
+
+    """
+    import asyncio
+    from contextlib import AsyncExitStack
+    from aiobotocore.config import AioConfig
+    import aiobotocore.session
+
+    if session is None:
+        session = aiobotocore.session.get_session()
+
+    region = session.get_config_variable('region')
+
+    config = AioConfig(**_CLIENT_CONFIG_ARGS)
+    async with AsyncExitStack() as stack:
+        sts_client = await stack.enter_async_context(session.create_client('sts', config=config))
+
+        if disable_account_alias is not False:
+            # as in whoami(), check the filters before deciding to call IAM
+            response = await sts_client.get_caller_identity()
+            whoami_info, disable_account_alias = _build_whoami_info(response, region, disable_account_alias)
+            if not disable_account_alias:
+                iam_client = await stack.enter_async_context(session.create_client('iam', config=config))
+                whoami_info.AccountAliases.extend(await _get_account_aliases_async(iam_client))
+            return whoami_info
+
+        iam_client = await stack.enter_async_context(session.create_client('iam', config=config))
+        iam_task = asyncio.ensure_future(_get_account_aliases_async(iam_client))
 
-    data['AccountAliases'] = []
-    if not isinstance(disable_account_alias, bool):
-        for value in disable_account_alias:
-            if data['Account'].startswith(value) or data['Account'].endswith(value):
-                disable_account_alias = True
-                break
-            fields = ['Name', 'Arn', 'RoleSessionName']
-            if any(value == data[field] for field in fields):
-                disable_account_alias = True
-                break
-    if not disable_account_alias:
         try:
-            #pedantry
-            paginator = session.create_client('iam').get_paginator('list_account_aliases')
-            for response in paginator.paginate():
-                data['AccountAliases'].extend(response['AccountAliases'])
-        except ClientError as e:
-            if e.response.get('Error', {}).get('Code') != 'AccessDenied':
-                raise
+            response = await sts_client.get_caller_identity()
+
+            whoami_info, _ = _build_whoami_info(response, region, disable_account_alias)
+
+            whoami_info.AccountAliases.extend(await iam_task)
+        finally:
+            # settle the task before its client is closed, and retrieve its
+            # exception so asyncio doesn't log it as never retrieved
+            if not iam_task.done():
+                iam_task.cancel()
+            await asyncio.gather(iam_task, return_exceptions=True)
 
-    return WhoamiInfo(**data)
+    return whoami_info
+
+def _build_whoami_info(response: Dict[str, Any], region: Optional[str],
+        disable_account_alias: Union[bool, Sequence[str]]) -> Tuple[WhoamiInfo, bool]:
+    """Build a WhoamiInfo from a GetCallerIdentity response.
+
+    AccountAliases is an empty list for the caller to fill in. Also returns
+    whether the account alias check is disabled for this identity.
+    """
+    account = response['Account']
+    arn = response['Arn']
+
+    match = _ARN_RE.match(arn)
+    if not match:
+        raise ValueError('Unexpected ARN format: {}'.format(arn))
+    type_ = match.group('assumed_role') or match.group('type')
+    name = match.group('name')
+
+    sso_permission_set = None
+    if type_ == 'assumed-role' and name.startswith(_SSO_ROLE_PREFIX):
+        # format is AWSReservedSSO_{permission-set}_{random-tag}
+        start = name.find('_')
+        if start != -1:
+            end = name.rfind('_')
+            if end == start:
+                end = len(name)
+            sso_permission_set = name[start + 1:end]
+
+    whoami_info = WhoamiInfo(
+        Account=account,
+        AccountAliases=[],
+        Arn=arn,
+        Type=type_,
+        Name=name,
+        RoleSessionName=match.group('session'),
+        UserId=response['UserId'],
+        Region=region,
+        SSOPermissionSet=sso_permission_set,
+    )
+
+    if not isinstance(disable_account_alias, bool):
+        field_values = tuple(getattr(whoami_info, field) for field in _FILTER_FIELDS)
+        disable_account_alias = any(
+            account.startswith(value) or account.endswith(value) or value in field_values
+            for value in disable_account_alias
+        )
+
+    return whoami_info, disable_account_alias
+
+def _get_client(session: Any, service: str) -> Any:
+    clients = getattr(session, _CLIENT_CACHE_ATTR, None) # type: Optional[Dict[str, Any]]
+    if clients is None:
+        clients = {}
+        setattr(session, _CLIENT_CACHE_ATTR, clients)
+    client = clients.get(service)
+    if client is None:
+        from botocore.config import Config
+        config = Config(**_CLIENT_CONFIG_ARGS)
+        client = session.create_client(service, config=config)
+        clients[service] = client
+    return client
+
+def _get_account_aliases(iam_client: Any) -> List[str]:
+    from botocore.exceptions import ClientError
+
+    # an account can have at most one alias, so there's no need to paginate
+    try:
+        response = iam_client.list_account_aliases()
+    except ClientError as e:
+        if e.response.get('Error', {}).get('Code') != 'AccessDenied':
+            raise
+        return []
+    return response.get('AccountAliases', [])
+
+async def _get_account_aliases_async(iam_client: Any) -> List[str]:
+    from botocore.exceptions import ClientError
+
+    # an account can have at most one alias, so there's no need to paginate
+    try:
+        response = await iam_client.list_account_aliases()
+    except ClientError as e:
+        if e.response.get('Error', {}).get('Code') != 'AccessDenied':
+            raise
+        return []
+    return response.get('AccountAliases', [])
 
 if __name__ == '__main__':
     main()
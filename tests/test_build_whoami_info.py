@@ -0,0 +1,84 @@
+import pytest
+
+from aws_whoami import _build_whoami_info
+
+ACCOUNT = '123456789012'
+
+def _build(arn, disable_account_alias=False):
+    response = {'Account': ACCOUNT, 'Arn': arn, 'UserId': 'AIDAEXAMPLE'}
+    return _build_whoami_info(response, 'us-east-2', disable_account_alias)
+
+def _principal(whoami_info):
+    return (whoami_info.Type, whoami_info.Name, whoami_info.RoleSessionName, whoami_info.SSOPermissionSet)
+
+@pytest.mark.parametrize('arn,expected', [
+    ('arn:aws:sts::123456789012:assumed-role/MY-ROLE/ben',
+        ('assumed-role', 'MY-ROLE', 'ben', None)),
+    ('arn:aws:iam::123456789012:user/bob',
+        ('user', 'bob', None, None)),
+    # IAM user paths stay part of the name
+    ('arn:aws:iam::123456789012:user/division/team/bob',
+        ('user', 'division/team/bob', None, None)),
+    ('arn:aws:sts::123456789012:federated-user/alice',
+        ('federated-user', 'alice', None, None)),
+    ('arn:aws-cn:sts::123456789012:assumed-role/MY-ROLE/ben',
+        ('assumed-role', 'MY-ROLE', 'ben', None)),
+])
+def test_principal(arn, expected):
+    whoami_info, _ = _build(arn)
+    assert _principal(whoami_info) == expected
+    assert whoami_info.Account == ACCOUNT
+    assert whoami_info.Arn == arn
+    assert whoami_info.UserId == 'AIDAEXAMPLE'
+    assert whoami_info.Region == 'us-east-2'
+    assert whoami_info.AccountAliases == []
+
+@pytest.mark.parametrize('role_name,permission_set', [
+    ('AWSReservedSSO_Admin_0123abcd', 'Admin'),
+    ('AWSReservedSSO_My_Perm_abc', 'My_Perm'),
+    ('AWSReservedSSO_Admin', 'Admin'),
+    ('AWSReservedSSO', None),
+])
+def test_sso_permission_set(role_name, permission_set):
+    whoami_info, _ = _build('arn:aws:sts::123456789012:assumed-role/{}/ben@example.com'.format(role_name))
+    assert whoami_info.Name == role_name
+    assert whoami_info.RoleSessionName == 'ben@example.com'
+    assert whoami_info.SSOPermissionSet == permission_set
+
+def test_sso_prefix_only_for_assumed_roles():
+    whoami_info, _ = _build('arn:aws:iam::123456789012:user/AWSReservedSSO_Admin_abc')
+    assert whoami_info.SSOPermissionSet is None
+
+@pytest.mark.parametrize('arn', [
+    'arn:aws:iam::123456789012:root',
+    'arn:aws:sts::123456789012:assumed-role/MY-ROLE',
+])
+def test_unexpected_arn(arn):
+    with pytest.raises(ValueError):
+        _build(arn)
+
+@pytest.mark.parametrize('disable_account_alias', [False, True])
+def test_disable_account_alias_bool(disable_account_alias):
+    _, disabled = _build('arn:aws:iam::123456789012:user/bob', disable_account_alias)
+    assert disabled is disable_account_alias
+
+@pytest.mark.parametrize('filters', [
+    ['1234'],  # account number prefix
+    ['9012'],  # account number suffix
+    ['MY-ROLE'],
+    ['arn:aws:sts::123456789012:assumed-role/MY-ROLE/ben'],
+    ['ben'],
+    ['nope', 'ben'],
+])
+def test_disable_account_alias_filter_matches(filters):
+    _, disabled = _build('arn:aws:sts::123456789012:assumed-role/MY-ROLE/ben', filters)
+    assert disabled is True
+
+@pytest.mark.parametrize('filters', [
+    ['nope'],
+    ['5678', 'OTHER-ROLE', 'alice'],
+    [],
+])
+def test_disable_account_alias_filter_no_match(filters):
+    _, disabled = _build('arn:aws:sts::123456789012:assumed-role/MY-ROLE/ben', filters)
+    assert disabled is False
@@ -0,0 +1,168 @@
+import os
+import time
+
+import pytest
+
+botocore_session = pytest.importorskip('botocore.session')
+from botocore.exceptions import ClientError
+
+import aws_whoami
+from aws_whoami import WhoamiInfo
+
+CONFIG = """
+[default]
+region = us-east-2
+
+[profile process]
+credential_process = false
+region = us-east-2
+
+[profile sso]
+sso_session = my-sso
+sso_account_id = 123456789012
+sso_role_name = Admin
+region = us-east-2
+
+[sso-session my-sso]
+sso_start_url = https://example.awsapps.com/start
+sso_region = us-east-1
+"""
+
+CREDENTIALS = """
+[default]
+aws_access_key_id = AKIDEXAMPLE
+aws_secret_access_key = secret
+"""
+
+WHOAMI_INFO = WhoamiInfo(
+    Account='123456789012',
+    AccountAliases=['my-alias'],
+    Arn='arn:aws:iam::123456789012:user/bob',
+    Type='user',
+    Name='bob',
+    RoleSessionName=None,
+    UserId='AIDAEXAMPLE',
+    Region='us-east-2',
+    SSOPermissionSet=None,
+)
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    for name in list(os.environ):
+        if name.startswith('AWS_'):
+            monkeypatch.delenv(name)
+    config_file = tmp_path / 'config'
+    config_file.write_text(CONFIG)
+    credentials_file = tmp_path / 'credentials'
+    credentials_file.write_text(CREDENTIALS)
+    monkeypatch.setenv('HOME', str(tmp_path))
+    monkeypatch.setenv('AWS_CONFIG_FILE', str(config_file))
+    monkeypatch.setenv('AWS_SHARED_CREDENTIALS_FILE', str(credentials_file))
+    cache_dir = tmp_path / 'whoami-cache'
+    monkeypatch.setattr(aws_whoami, 'CACHE_DIR', str(cache_dir))
+    return cache_dir
+
+def _cache_path(profile=None, disable_account_alias=False):
+    session = botocore_session.Session(profile=profile)
+    return aws_whoami._get_cache_path(session, disable_account_alias)
+
+def _age(path, seconds):
+    mtime = time.time() - seconds
+    os.utime(path, (mtime, mtime))
+
+def test_cache_path_static_key(cache_dir):
+    path = _cache_path()
+    assert os.path.dirname(path) == str(cache_dir)
+    assert _cache_path() == path
+    assert _cache_path(disable_account_alias=True) != path
+    assert _cache_path(disable_account_alias=['123456789012']) != path
+
+def test_cache_path_region(cache_dir, monkeypatch):
+    path = _cache_path()
+    monkeypatch.setenv('AWS_DEFAULT_REGION', 'eu-west-1')
+    assert _cache_path() != path
+
+def test_cache_path_profile_settings(cache_dir):
+    # keyed on the profile's settings, without running the credential process
+    path = _cache_path(profile='process')
+    assert path is not None
+    assert _cache_path(profile='process') == path
+    assert path != _cache_path(profile='sso')
+
+def test_cache_path_missing_profile(cache_dir):
+    assert _cache_path(profile='missing') is None
+
+def test_read_write(cache_dir):
+    path = _cache_path()
+    assert aws_whoami._read_cache(path, 600) is None
+    aws_whoami._write_cache(path, WHOAMI_INFO, 600)
+    assert aws_whoami._read_cache(path, 600) == WHOAMI_INFO
+    _age(path, 601)
+    assert aws_whoami._read_cache(path, 600) is None
+
+def test_read_corrupt(cache_dir):
+    path = _cache_path()
+    cache_dir.mkdir()
+    with open(path, 'w') as fp:
+        fp.write('{"Account": ')
+    assert aws_whoami._read_cache(path, 600) is None
+
+def test_prune(cache_dir):
+    cache_dir.mkdir()
+    stale = [cache_dir / 'stale.json', cache_dir / 'abandoned.tmp']
+    fresh = cache_dir / 'fresh.json'
+    other = cache_dir / 'other.txt'
+    for path in stale + [fresh, other]:
+        path.write_text('')
+    for path in stale + [other]:
+        _age(str(path), 601)
+    path = _cache_path()
+    aws_whoami._write_cache(path, WHOAMI_INFO, 600)
+    assert sorted(os.listdir(str(cache_dir))) == sorted([os.path.basename(path), 'fresh.json', 'other.txt'])
+
+class _Whoami:
+    def __init__(self, error=None):
+        self.calls = 0
+        self.error = error
+
+    def __call__(self, session=None, disable_account_alias=False):
+        self.calls += 1
+        if self.error:
+            raise self.error
+        return WHOAMI_INFO
+
+def _main(monkeypatch, whoami, *args):
+    monkeypatch.setattr(aws_whoami, 'whoami', whoami)
+    monkeypatch.setattr(aws_whoami, '_prewarm_dns', lambda region, sts_regional_endpoints: None)
+    monkeypatch.setattr('sys.argv', ['aws-whoami', '--json'] + list(args))
+    try:
+        aws_whoami.main()
+    except SystemExit as e:
+        return e.code
+    return 0
+
+def test_main_uses_cache(cache_dir, monkeypatch, capsys):
+    whoami = _Whoami()
+    assert _main(monkeypatch, whoami) == 0
+    first = capsys.readouterr().out
+    assert _main(monkeypatch, whoami) == 0
+    assert capsys.readouterr().out == first
+    assert whoami.calls == 1
+
+def test_main_client_error_removes_entry(cache_dir, monkeypatch):
+    path = _cache_path()
+    aws_whoami._write_cache(path, WHOAMI_INFO, 600)
+    _age(path, 601)
+    error = ClientError({'Error': {'Code': 'ExpiredToken', 'Message': 'expired'}}, 'GetCallerIdentity')
+    assert _main(monkeypatch, _Whoami(error)) == 1
+    assert not os.path.exists(path)
+
+def test_main_expired_login_ignores_cache(cache_dir, monkeypatch, capsys):
+    # there's no SSO token, so the cached identity must not be reported
+    path = _cache_path(profile='sso')
+    aws_whoami._write_cache(path, WHOAMI_INFO, 600)
+    whoami = _Whoami()
+    assert _main(monkeypatch, whoami, '--profile', 'sso') == 1
+    assert capsys.readouterr().out == ''
+    assert whoami.calls == 0
+    assert not os.path.exists(path)
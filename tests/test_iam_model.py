@@ -0,0 +1,65 @@
+import pytest
+
+botocore_session = pytest.importorskip('botocore.session')
+from botocore.awsrequest import AWSResponse
+
+from aws_whoami import _get_account_aliases, _get_client, _use_trimmed_iam_model
+
+LIST_ACCOUNT_ALIASES_RESPONSE = b"""<ListAccountAliasesResponse xmlns="https://iam.amazonaws.com/doc/2010-05-08/">
+  <ListAccountAliasesResult>
+    <IsTruncated>false</IsTruncated>
+    <AccountAliases>
+      <member>my-alias</member>
+    </AccountAliases>
+  </ListAccountAliasesResult>
+  <ResponseMetadata>
+    <RequestId>7a62c49f-347e-4fc4-9331-6e8eEXAMPLE</RequestId>
+  </ResponseMetadata>
+</ListAccountAliasesResponse>"""
+
+class _RawResponse:
+    def __init__(self, body):
+        self.body = body
+
+    def stream(self, **kwargs):
+        yield self.body
+
+def _text(value):
+    # str or bytes, depending on the botocore version
+    if isinstance(value, bytes):
+        return value.decode('utf-8')
+    return value
+
+@pytest.fixture
+def session(tmp_path, monkeypatch):
+    monkeypatch.setenv('AWS_CONFIG_FILE', str(tmp_path / 'config'))
+    monkeypatch.setenv('AWS_SHARED_CREDENTIALS_FILE', str(tmp_path / 'credentials'))
+    monkeypatch.setenv('AWS_ACCESS_KEY_ID', 'AKIDEXAMPLE')
+    monkeypatch.setenv('AWS_SECRET_ACCESS_KEY', 'secret')
+    monkeypatch.setenv('AWS_DEFAULT_REGION', 'us-east-2')
+    for name in ['AWS_PROFILE', 'AWS_SESSION_TOKEN', 'AWS_ENDPOINT_URL', 'AWS_ENDPOINT_URL_IAM']:
+        monkeypatch.delenv(name, raising=False)
+    session = botocore_session.Session()
+    _use_trimmed_iam_model(session)
+    return session
+
+def test_trimmed_model(session):
+    iam_client = _get_client(session, 'iam')
+    assert iam_client.meta.service_model.operation_names == ['ListAccountAliases']
+
+    requests = []
+    def send(request, **kwargs):
+        requests.append(request)
+        return AWSResponse(request.url, 200, {}, _RawResponse(LIST_ACCOUNT_ALIASES_RESPONSE))
+    iam_client.meta.events.register('before-send', send)
+
+    assert _get_account_aliases(iam_client) == ['my-alias']
+
+    request, = requests
+    assert request.url == 'https://iam.amazonaws.com/'
+    assert 'Action=ListAccountAliases' in _text(request.body)
+    assert '/us-east-1/iam/aws4_request' in _text(request.headers['Authorization'])
+
+def test_other_models_untouched(session):
+    sts_client = _get_client(session, 'sts')
+    assert 'GetCallerIdentity' in sts_client.meta.service_model.operation_names
@@ -0,0 +1,56 @@
+import pytest
+
+from aws_whoami import _parse_args, _UsageError
+
+def test_defaults():
+    args = _parse_args([])
+    assert args.profile is None
+    assert args.field is None
+    assert not (args.json or args.no_aliases or args.version or args.debug or args.help)
+
+def test_flags():
+    args = _parse_args(['--json', '--no-aliases', '--version', '--debug'])
+    assert args.json and args.no_aliases and args.version and args.debug
+
+@pytest.mark.parametrize('argv', [
+    ['--profile', 'my-profile'],
+    ['--profile=my-profile'],
+])
+def test_profile(argv):
+    assert _parse_args(argv).profile == 'my-profile'
+
+def test_profile_value_with_equals():
+    assert _parse_args(['--profile=a=b']).profile == 'a=b'
+
+def test_field_forms():
+    args = _parse_args(['--field', 'Account', '--field=Arn', '-f', 'Name', '-fRegion'])
+    assert args.field == ['Account', 'Arn', 'Name', 'Region']
+
+@pytest.mark.parametrize('argv', [
+    ['--profile'],
+    ['--field'],
+    ['-f'],
+])
+def test_missing_value(argv):
+    with pytest.raises(_UsageError, match='expected one argument'):
+        _parse_args(argv)
+
+@pytest.mark.parametrize('argv', [
+    ['--field', 'Nope'],
+    ['--field=Nope'],
+    ['-fNope'],
+])
+def test_invalid_field(argv):
+    with pytest.raises(_UsageError, match='invalid choice'):
+        _parse_args(argv)
+
+def test_unrecognized():
+    with pytest.raises(_UsageError, match='unrecognized arguments: --bogus extra'):
+        _parse_args(['--bogus', '--json', 'extra'])
+
+@pytest.mark.parametrize('argv', [
+    ['--bogus', '--help'],
+    ['-h', '--field=Nope'],
+])
+def test_help_wins(argv):
+    assert _parse_args(argv).help